@@ -1,4 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import hashlib
+import mmap
 import pathlib
 import pkg_resources
 import signal
@@ -24,6 +27,7 @@ from . import history
 from . import message_box
 from . import meta_tool
 from . import preferences
+from .table_model import DCKitModel, IntegrityButtonDelegate
 from . import update
 from .wait_cursor import show_wait_cursor, ShowWaitCursor
 from ._version import version
@@ -53,6 +57,12 @@ class DCKit(QtWidgets.QMainWindow):
         preferences.register_temporary_features()
         # Disable native menubar (e.g. on Mac)
         self.menubar.setNativeMenuBar(False)
+        # table model and integrity button delegate
+        self.model = DCKitModel(self)
+        self.tableView.setModel(self.model)
+        self.integrity_delegate = IntegrityButtonDelegate(self.tableView)
+        self.tableView.setItemDelegateForColumn(DCKitModel.COL_INTEGRITY,
+                                                self.integrity_delegate)
         # signals
         self.pushButton_integrity.clicked.connect(self.on_task_integrity_all)
         self.pushButton_compress.clicked.connect(self.on_task_compress)
@@ -60,7 +70,8 @@ class DCKit(QtWidgets.QMainWindow):
         self.pushButton_split.clicked.connect(self.on_task_split)
         self.pushButton_tdms2rtdc.clicked.connect(self.on_task_tdms2rtdc)
         self.pushButton_join.clicked.connect(self.on_task_join)
-        self.tableWidget.itemChanged.connect(self.on_table_text_changed)
+        self.model.dataChanged.connect(self.on_table_text_changed)
+        self.integrity_delegate.clicked.connect(self.on_integrity_check)
         self.checkBox_repack.clicked.connect(self.on_repack)
         # File menu
         self.action_add.triggered.connect(self.on_action_add_measurements)
@@ -74,8 +85,11 @@ class DCKit(QtWidgets.QMainWindow):
         self.actionAbout.triggered.connect(self.on_action_about)
         #: contains all imported paths (index is DCKit-id)
         self.pathlist = []
-        # contains all integrity buttons (keys are DCKit-ids)
-        self.integrity_buttons = {}
+        #: thread pool for data processing tasks; HDF5 access is
+        #: serialized by h5py and dclab records warnings via the
+        #: (process-global) warnings module, so one thread is used.
+        self.task_pool = QtCore.QThreadPool(self)
+        self.task_pool.setMaxThreadCount(1)
         # if "--version" was specified, print the version and exit
         if "--version" in sys.argv:
             print(version)
@@ -93,71 +107,34 @@ class DCKit(QtWidgets.QMainWindow):
     @show_wait_cursor
     def append_paths(self, pathlist):
         """Append selected paths to table"""
+        if not pathlist:
+            return
         datas = []
-        # get meta data for all paths
-        for path in pathlist:
-            try:  # avoid any errors
-                info = {"DCKit-id": (0, len(self.pathlist)),
-                        "integrity": (1, None),
-                        "path": (2, path),
-                        "sample": (3, meta_tool.get_sample_name(path)),
-                        "run index": (4, meta_tool.get_run_index(path)),
-                        "event count": (5, meta_tool.get_event_count(path)),
-                        "flow rate": (6, meta_tool.get_flow_rate(path)),
-                        "chip region": (None, meta_tool.get_chip_region(path)),
-                        }
-            except BaseException:
+        # get meta data for all paths (I/O-bound, so use threads)
+        with ThreadPoolExecutor(max_workers=min(8, len(pathlist))) as ex:
+            results = list(ex.map(get_row_metadata, pathlist))
+        for path, (meta, error) in zip(pathlist, results):
+            if error is not None:
                 warnings.warn("Could not append dataset {} ".format(path)
                               + "(traceback follows)!\n"
-                              + "{}".format(traceback.format_exc()))
+                              + "{}".format(error))
                 # stop doing anything
                 continue
+            info = (len(self.pathlist), pathlib.Path(path)) + meta
             self.pathlist.append(pathlib.Path(path))
             datas.append(info)
-        # populate table widget
-        for info in datas:
-            row = self.tableWidget.rowCount()
-            self.tableWidget.insertRow(row)
-            for key in info:
-                col, val = info[key]
-                if col is None:
-                    continue
-                if key == "integrity":
-                    # button
-                    btn = QtWidgets.QToolButton(self)
-                    btn.setText("run check")
-                    self.tableWidget.setCellWidget(row, col, btn)
-                    btn.clicked.connect(self.on_integrity_check)
-                    self.integrity_buttons[info["DCKit-id"][1]] = btn
-                else:
-                    # text
-                    item = QtWidgets.QTableWidgetItem("{}".format(val))
-                    if key == "sample":
-                        # allow editing sample name
-                        item.setFlags(QtCore.Qt.ItemIsEnabled
-                                      | QtCore.Qt.ItemIsEditable)
-                    elif key == "path":
-                        item.setText(pathlib.Path(val).name)
-                        item.setToolTip(str(val))
-                        item.setFlags(QtCore.Qt.ItemIsEnabled)
-                    elif key == "flow rate":
-                        if info["chip region"][1] == "channel":
-                            item.setText("{:.5f}".format(val))
-                        else:
-                            item.setText("reservoir")
-                        item.setFlags(QtCore.Qt.ItemIsEnabled)
-                    else:
-                        item.setFlags(QtCore.Qt.ItemIsEnabled)
-                    self.tableWidget.setItem(row, col, item)
+        # populate table model (single insertion for all rows)
+        self.model.append_rows(datas)
         if datas:
             # set header widths
-            self.tableWidget.setColumnWidth(info["DCKit-id"][0], 10)
-            self.tableWidget.setColumnWidth(info["integrity"][0], 100)
-            self.tableWidget.setColumnWidth(info["path"][0], 180)
-            self.tableWidget.setColumnWidth(info["run index"][0], 80)
-            self.tableWidget.setColumnWidth(info["flow rate"][0], 100)
-            self.tableWidget.setColumnWidth(info["event count"][0], 80)
-            self.tableWidget.setColumnWidth(info["sample"][0], 300)
+            tv = self.tableView
+            tv.setColumnWidth(DCKitModel.COL_ID, 10)
+            tv.setColumnWidth(DCKitModel.COL_INTEGRITY, 100)
+            tv.setColumnWidth(DCKitModel.COL_PATH, 180)
+            tv.setColumnWidth(DCKitModel.COL_RUN_INDEX, 80)
+            tv.setColumnWidth(DCKitModel.COL_FLOW_RATE, 100)
+            tv.setColumnWidth(DCKitModel.COL_EVENT_COUNT, 80)
+            tv.setColumnWidth(DCKitModel.COL_SAMPLE, 300)
 
     def dragEnterEvent(self, e):
         """Whether files are accepted"""
@@ -182,7 +159,7 @@ class DCKit(QtWidgets.QMainWindow):
         path = self.get_path(row)
         metadata = IntegrityCheckDialog.metadata_from_path(path)
         # update sample name
-        newname = self.tableWidget.item(row, 3).text()
+        newname = self.model.get_sample(row)
         if "experiment" not in metadata:
             metadata["experiment"] = {}
         metadata["experiment"]["sample"] = newname
@@ -193,9 +170,44 @@ class DCKit(QtWidgets.QMainWindow):
 
         This is necessary, because the user can sort columns
         """
-        path_index = int(self.tableWidget.item(row, 0).text())
-        path = self.pathlist[path_index]
-        return path
+        return self.model.get_path(row)
+
+    def get_task_runnables(self, func, pout, suffix, invalid):
+        """Return a `TaskRunnable` for every dataset with a given suffix
+
+        Parameters
+        ----------
+        func: callable
+            Task function with the signature
+            `func(path_in, dir_out, metadata, repack)`
+        pout: pathlib.Path
+            Output directory
+        suffix: str
+            Only datasets with this file suffix are processed
+        invalid: list
+            Paths of all other datasets are appended to this list
+        """
+        runnables = []
+        # rows with identical path and sample name have the same output
+        scheduled = set()
+        with ShowWaitCursor():
+            for row in range(self.model.rowCount()):
+                path = self.get_path(row)
+                if path.suffix != suffix:
+                    # do not do anything with these files
+                    invalid.append(path)
+                    continue
+                metadata = self.get_metadata(row)
+                key = (path, metadata["experiment"]["sample"])
+                if key not in scheduled:
+                    scheduled.add(key)
+                    runnables.append(TaskRunnable(
+                        func,
+                        path_in=path,
+                        dir_out=pout,
+                        metadata=metadata,
+                        repack=self.checkBox_repack.isChecked()))
+        return runnables
 
     @QtCore.pyqtSlot()
     def on_action_add_folder(self):
@@ -278,12 +290,11 @@ class DCKit(QtWidgets.QMainWindow):
     @QtCore.pyqtSlot()
     def on_action_clear_measurements(self):
         """Clear the table"""
-        for _ in range(len(self.pathlist)):
-            self.tableWidget.removeRow(0)
+        self.model.clear()
         self.pathlist.clear()
-        self.integrity_buttons.clear()
         # clear lru_cache
         meta_tool.get_rtdc_meta.cache_clear()
+        meta_tool.get_summary_cached.cache_clear()
         dlg_icheck.check_dataset.cache_clear()
 
     @QtCore.pyqtSlot()
@@ -318,32 +329,17 @@ class DCKit(QtWidgets.QMainWindow):
         """Determine what happens when the user wants to quit"""
         QtCore.QCoreApplication.quit()
 
-    @QtCore.pyqtSlot()
-    def on_integrity_check(self, button=None):
-        if button is None:
-            button = self.sender()
-            skip_ui = False
-        else:
-            skip_ui = True
-        # find DCKit-id
-        for did in self.integrity_buttons:
-            if button is self.integrity_buttons[did]:
-                break
-        else:
-            raise ValueError("Could not find button {}".format(button))
-        # get path
-        path = self.pathlist[did]
+    @QtCore.pyqtSlot(int)
+    def on_integrity_check(self, row, skip_ui=False):
+        """Run the integrity check for a table row"""
+        path = self.get_path(row)
         with ShowWaitCursor():
             dlg = IntegrityCheckDialog(self, path)
         if skip_ui:
             dlg.done(True)
         else:
             dlg.exec_()
-        button.setText(dlg.state)
-        colors = {"failed": "#A50000",
-                  "tolerable": "#7A6500",
-                  "passed": "#007A04"}
-        button.setStyleSheet("color: {}".format(colors[dlg.state]))
+        self.model.set_integrity(row, dlg.state)
 
     @QtCore.pyqtSlot()
     def on_repack(self):
@@ -362,56 +358,39 @@ class DCKit(QtWidgets.QMainWindow):
         else:
             self.pushButton_metadata.setEnabled(True)
 
-    @QtCore.pyqtSlot()
-    def on_table_text_changed(self):
+    @QtCore.pyqtSlot(QtCore.QModelIndex, QtCore.QModelIndex)
+    def on_table_text_changed(self, top_left, bottom_right):
         """Reset sample name if set to empty string"""
-        curit = self.tableWidget.currentItem()
-        if curit is not None and curit.text() == "":
-            row = self.tableWidget.currentRow()
-            path = self.get_path(row)
-            sample = meta_tool.get_sample_name(path)
-            self.tableWidget.item(row, 3).setText(sample)
+        if (top_left.column() <= DCKitModel.COL_SAMPLE
+                <= bottom_right.column()):
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                if self.model.get_sample(row) == "":
+                    path = self.get_path(row)
+                    sample = meta_tool.get_sample_name(path)
+                    self.model.setData(
+                        self.model.index(row, DCKitModel.COL_SAMPLE), sample)
 
     @QtCore.pyqtSlot()
     def on_task_compress(self):
         """Compress .rtdc data losslessly"""
         # Open the target directory
         pout = QtWidgets.QFileDialog.getExistingDirectory(self)
-        details = []
+        if not pout:
+            return
+        pout = pathlib.Path(pout)
         invalid = []
         paths_compressed = []
-        if pout:
-            with ShowWaitCursor():
-                pout = pathlib.Path(pout)
-                for row in range(self.tableWidget.rowCount()):
-                    path = self.get_path(row)
-                    metadata = self.get_metadata(row)
-                    name = metadata["experiment"]["sample"]
-                    prtdc = pout / get_rtdc_output_name(origin_path=path,
-                                                        sample_name=name)
-                    if path.suffix == ".rtdc":
-                        task_dict = {
-                            "name": "compress HDF5 data",
-                        }
-                        dclab.cli.compress(path_in=path, path_out=prtdc)
-                        append_execution_log(prtdc, task_dict)
-                        task_dict_meta = self.write_metadata(prtdc, metadata)
-                        if task_dict_meta:
-                            append_execution_log(prtdc, task_dict_meta)
-                        # write any warnings to separate log files
-                        extract_warning_logs(prtdc)
-                        # update list for UI
-                        details.append("{} -> {}".format(path, prtdc))
-                        paths_compressed.append(prtdc)
-                        # repack if checked
-                        # (we still did the compression in case dclab needed
-                        # to fix things)
-                        self.repack(prtdc)
-                    else:
-                        # do not do anything with .rtdc files
-                        invalid.append(path)
-        else:
-            return
+        runnables = self.get_task_runnables(task_compress, pout,
+                                            suffix=".rtdc",
+                                            invalid=invalid)
+        results, errors = self.run_task_runnables(
+            runnables, "Compressing .rtdc files...")
+        details = []
+        for rn, prtdc in zip(runnables, results):
+            if prtdc is not None:
+                # update list for UI
+                details.append("{} -> {}".format(rn.path, prtdc))
+                paths_compressed.append(prtdc)
 
         if invalid:
             message_box.ignored(
@@ -419,21 +398,26 @@ class DCKit(QtWidgets.QMainWindow):
                 details="Affected files are:\n"
                         + "\n\n".join([str(p) for p in invalid]))
 
+        if errors:
+            message_box.error(
+                message=f"{len(errors)} files could not be compressed!",
+                details="Affected files are:\n\n"
+                        + "\n\n".join(["{}:\n{}".format(*e) for e in errors]))
+
         # finally, show the feedback dialog
         if len(details):
             message_box.success(
                 message=f"Successfully compressed {len(details)} .rtdc files!",
                 details="\n\n".join(details))
-        elif not invalid:
+        elif not (errors or invalid):
             message_box.nothing_todo()
         return paths_compressed, invalid
 
     @show_wait_cursor
     @QtCore.pyqtSlot()
     def on_task_integrity_all(self):
-        for did in self.integrity_buttons:
-            btn = self.integrity_buttons[did]
-            self.on_integrity_check(button=btn)
+        for row in range(self.model.rowCount()):
+            self.on_integrity_check(row, skip_ui=True)
 
     @QtCore.pyqtSlot()
     def on_task_join(self):
@@ -455,7 +439,7 @@ class DCKit(QtWidgets.QMainWindow):
                 if not po.suffix == ".rtdc":
                     po = po.parent / (po.name + ".rtdc")
                 pi = []
-                for row in range(self.tableWidget.rowCount()):
+                for row in range(self.model.rowCount()):
                     pi.append(self.get_path(row))
                 # finally, show the feedback dialog
                 msg = QtWidgets.QMessageBox()
@@ -485,7 +469,7 @@ class DCKit(QtWidgets.QMainWindow):
         invalid = []
         details = []
         with ShowWaitCursor():
-            for row in range(self.tableWidget.rowCount()):
+            for row in range(self.model.rowCount()):
                 path = self.get_path(row)
                 # check whether we are allowed to do this
                 if path.suffix == ".tdms":
@@ -493,7 +477,7 @@ class DCKit(QtWidgets.QMainWindow):
                     invalid.append(path)
                 else:
                     metadata = self.get_metadata(row)
-                    task_dict_meta = self.write_metadata(path, metadata)
+                    task_dict_meta = write_metadata(path, metadata)
                     if task_dict_meta:
                         append_execution_log(path, task_dict_meta)
                         # update list for UI
@@ -542,7 +526,7 @@ class DCKit(QtWidgets.QMainWindow):
                     task_dict = {
                         "name": "split every {} events".format(split_events),
                     }
-                    for row in range(self.tableWidget.rowCount()):
+                    for row in range(self.model.rowCount()):
                         path = self.get_path(row)
                         try:
                             psplit = dclab.cli.split(
@@ -594,44 +578,16 @@ class DCKit(QtWidgets.QMainWindow):
         paths_converted = []
         if pout:
             pout = pathlib.Path(pout)
-            with ShowWaitCursor():
-                for row in range(self.tableWidget.rowCount()):
-                    path = self.get_path(row)
-                    metadata = self.get_metadata(row)
-                    name = metadata["experiment"]["sample"]
-                    prtdc = pout / get_rtdc_output_name(origin_path=path,
-                                                        sample_name=name)
-                    if path.suffix == ".tdms":
-                        task_dict = {
-                            "name": "convert .tdms to .rtdc",
-                        }
-                        try:
-                            dclab.cli.tdms2rtdc(path_tdms=path,
-                                                path_rtdc=prtdc,
-                                                compute_features=False,
-                                                skip_initial_empty_image=True,
-                                                skip_final_empty_image=True,
-                                                verbose=False)
-                        except BaseException:
-                            errors.append([path, traceback.format_exc()])
-                            if prtdc.exists():
-                                prtdc.unlink()
-                        else:
-                            append_execution_log(prtdc, task_dict)
-                            task_dict_meta = self.write_metadata(prtdc,
-                                                                 metadata)
-                            if task_dict_meta:
-                                append_execution_log(prtdc, task_dict_meta)
-                            # write any warnings to separate log files
-                            extract_warning_logs(prtdc)
-                            # update list for UI
-                            details.append("{} -> {}".format(path, prtdc))
-                            paths_converted.append(prtdc)
-                            # repack if checked
-                            self.repack(prtdc)
-                    else:
-                        # do not do anything with .rtdc files
-                        invalid.append(path)
+            runnables = self.get_task_runnables(task_tdms2rtdc, pout,
+                                                suffix=".tdms",
+                                                invalid=invalid)
+            results, errors = self.run_task_runnables(
+                runnables, "Converting .tdms files...")
+            for rn, prtdc in zip(runnables, results):
+                if prtdc is not None:
+                    # update list for UI
+                    details.append("{} -> {}".format(rn.path, prtdc))
+                    paths_converted.append(prtdc)
         if invalid:
             # Show an error dialog for the tdms files
             message_box.ignored(
@@ -658,58 +614,85 @@ class DCKit(QtWidgets.QMainWindow):
     @show_wait_cursor
     def repack(self, path):
         """repack and strip logs if the checkbox is checked"""
-        if not self.checkBox_repack.isChecked():
-            return
+        if self.checkBox_repack.isChecked():
+            repack_strip_logs(path)
 
-        path = pathlib.Path(path)
-        # rename the original file
-        path_orig = path.with_name(path.stem + "_original.rtdc")
-        path.rename(path_orig)
-        try:
-            repack(path_in=path_orig, path_out=path, strip_logs=True)
-        except BaseException:
-            path_orig.unlink()
-            if path.exists():
-                path.unlink()
-            raise
-        else:
-            path_orig.unlink()
+    def run_task_runnables(self, runnables, label):
+        """Run tasks in the thread pool and wait until they are done
 
-    @show_wait_cursor
-    def write_metadata(self, path, metadata):
-        """Write metadata to an HDF5 file
+        A progress dialog is shown and the Qt event loop keeps
+        running, so the user interface stays responsive.
 
         Returns
         -------
-        `task_dict` if anything changed or None
+        results: list
+            Return values of the task functions (None for failed tasks)
+        errors: list
+            Input path and traceback for each failed task
         """
-        # entry for the log
-        task_dict = {
-            "name": "update metadata",
-            "old": {},
-            "new": {},
-        }
-        # update in-place
-        with h5py.File(path, "a") as h5:
-            for sec in metadata:
-                for key in metadata[sec]:
-                    h5key = "{}:{}".format(sec, key)
-                    value = metadata[sec][key]
-                    value_old = h5.attrs.get(h5key, None)
-                    if isinstance(value_old, bytes):
-                        value_old = value_old.decode("utf-8")
-                    if isinstance(value, bytes):
-                        value = value.decode("utf-8")
-                    if value != value_old:
-                        task_dict["new"][h5key] = value
-                        task_dict["old"][h5key] = value_old
-                        if isinstance(value, str):  # (after task_dict)
-                            value = numpy.string_(value.encode("utf-8"))
-                        h5.attrs[h5key] = value
-        if task_dict["new"]:
-            return task_dict
+        results = [None] * len(runnables)
+        errors = []
+        progress = QtWidgets.QProgressDialog(label, None, 0, len(runnables),
+                                             self)
+        progress.setWindowTitle("DCKit")
+        progress.setWindowModality(QtCore.Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setValue(0)
+        loop = QtCore.QEventLoop()
+        counter = [0]
+
+        def on_finished():
+            counter[0] += 1
+            progress.setValue(counter[0])
+            if counter[0] == len(runnables):
+                loop.quit()
+
+        for ii, rn in enumerate(runnables):
+            rn.signals.done.connect(
+                functools.partial(results.__setitem__, ii))
+            rn.signals.error.connect(
+                lambda path, tb: errors.append([path, tb]))
+            rn.signals.finished.connect(on_finished)
+            self.task_pool.start(rn)
+        if counter[0] < len(runnables):
+            loop.exec_()
+        progress.close()
+        return results, errors
+
+
+class TaskSignals(QtCore.QObject):
+    """Signals emitted by `TaskRunnable`"""
+    #: emitted with the return value of the task function
+    done = QtCore.pyqtSignal(object)
+    #: emitted with the input path and the traceback
+    error = QtCore.pyqtSignal(object, str)
+    #: emitted after `done` or `error`
+    finished = QtCore.pyqtSignal()
+
+
+class TaskRunnable(QtCore.QRunnable):
+    """Run a task for a single dataset in a thread pool
+
+    The task function must not access any Qt widgets. Results
+    are communicated via the `signals` attribute (`TaskSignals`).
+    """
+    def __init__(self, func, path_in, **kwargs):
+        super(TaskRunnable, self).__init__()
+        self.setAutoDelete(False)
+        self.func = func
+        self.path = path_in
+        self.kwargs = kwargs
+        #: signals (created in the main thread)
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            ret = self.func(path_in=self.path, **self.kwargs)
+        except BaseException:
+            self.signals.error.emit(self.path, traceback.format_exc())
         else:
-            return None
+            self.signals.done.emit(ret)
+        self.signals.finished.emit()
 
 
 def append_execution_log(path, task_dict):
@@ -757,6 +740,34 @@ def extract_warning_logs(path):
             plog.write_text("\r\n".join(logs[lname]))
 
 
+def get_row_metadata(path):
+    """Return the metadata of a dataset that are shown in the table
+
+    This function is executed in a thread pool by `DCKit.append_paths`.
+
+    Returns
+    -------
+    meta: tuple or None
+        Sample name, run index, event count, and formatted flow rate
+    error: str or None
+        Traceback if the metadata could not be read
+    """
+    try:  # avoid any errors
+        summary = meta_tool.get_summary(path)
+        if summary["chip region"] == "channel":
+            flow_rate = "{:.5f}".format(summary["flow rate"])
+        else:
+            flow_rate = "reservoir"
+        meta = (summary["sample"],
+                summary["run index"],
+                summary["event count"],
+                flow_rate,
+                )
+    except BaseException:
+        return None, traceback.format_exc()
+    return meta, None
+
+
 def get_rtdc_output_name(origin_path, sample_name):
 
     if meta_tool.get_chip_region(origin_path) == "channel":
@@ -803,8 +814,143 @@ def get_valid_filename(value):
     return ret
 
 
+def repack_strip_logs(path):
+    """Repack an .rtdc file in-place and strip all logs"""
+    path = pathlib.Path(path)
+    # rename the original file
+    path_orig = path.with_name(path.stem + "_original.rtdc")
+    path.rename(path_orig)
+    try:
+        repack(path_in=path_orig, path_out=path, strip_logs=True)
+    except BaseException:
+        path_orig.unlink()
+        if path.exists():
+            path.unlink()
+        raise
+    else:
+        path_orig.unlink()
+
+
 def sha256(path):
-    return dclab.util.hashfile(path, constructor=hashlib.sha256)
+    """Return the SHA-256 hex digest of a file
+
+    The result is cached. The modification time and the size of
+    the file are part of the cache key, so the cache is invalidated
+    whenever the file is modified.
+    """
+    path = pathlib.Path(path).resolve()
+    stat = path.stat()
+    return sha256_cached(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=512)
+def sha256_cached(path, mtime_ns, size):
+    """Caching function for `sha256` (use that function instead)"""
+    with path.open("rb") as fd:
+        if hasattr(hashlib, "file_digest"):
+            # Python >= 3.11, OpenSSL uses hardware acceleration if possible
+            return hashlib.file_digest(fd, "sha256").hexdigest()
+        hasher = hashlib.sha256()
+        if size:  # (empty files cannot be mapped)
+            # pass the whole file as a single buffer to OpenSSL
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        return hasher.hexdigest()
+
+
+def task_compress(path_in, dir_out, metadata, repack):
+    """Compress an .rtdc file (executed in a `TaskRunnable`)
+
+    Returns the path of the output file
+    """
+    name = metadata["experiment"]["sample"]
+    prtdc = dir_out / get_rtdc_output_name(origin_path=path_in,
+                                           sample_name=name)
+    task_dict = {
+        "name": "compress HDF5 data",
+    }
+    dclab.cli.compress(path_in=path_in, path_out=prtdc)
+    append_execution_log(prtdc, task_dict)
+    task_dict_meta = write_metadata(prtdc, metadata)
+    if task_dict_meta:
+        append_execution_log(prtdc, task_dict_meta)
+    # write any warnings to separate log files
+    extract_warning_logs(prtdc)
+    # repack if checked
+    # (we still did the compression in case dclab needed to fix things)
+    if repack:
+        repack_strip_logs(prtdc)
+    return prtdc
+
+
+def task_tdms2rtdc(path_in, dir_out, metadata, repack):
+    """Convert a .tdms file to .rtdc (executed in a `TaskRunnable`)
+
+    Returns the path of the output file
+    """
+    name = metadata["experiment"]["sample"]
+    prtdc = dir_out / get_rtdc_output_name(origin_path=path_in,
+                                           sample_name=name)
+    task_dict = {
+        "name": "convert .tdms to .rtdc",
+    }
+    try:
+        dclab.cli.tdms2rtdc(path_tdms=path_in,
+                            path_rtdc=prtdc,
+                            compute_features=False,
+                            skip_initial_empty_image=True,
+                            skip_final_empty_image=True,
+                            verbose=False)
+    except BaseException:
+        if prtdc.exists():
+            prtdc.unlink()
+        raise
+    append_execution_log(prtdc, task_dict)
+    task_dict_meta = write_metadata(prtdc, metadata)
+    if task_dict_meta:
+        append_execution_log(prtdc, task_dict_meta)
+    # write any warnings to separate log files
+    extract_warning_logs(prtdc)
+    # repack if checked
+    if repack:
+        repack_strip_logs(prtdc)
+    return prtdc
+
+
+def write_metadata(path, metadata):
+    """Write metadata to an HDF5 file
+
+    Returns
+    -------
+    `task_dict` if anything changed or None
+    """
+    # entry for the log
+    task_dict = {
+        "name": "update metadata",
+        "old": {},
+        "new": {},
+    }
+    # update in-place
+    with h5py.File(path, "a") as h5:
+        for sec in metadata:
+            for key in metadata[sec]:
+                h5key = "{}:{}".format(sec, key)
+                value = metadata[sec][key]
+                value_old = h5.attrs.get(h5key, None)
+                if isinstance(value_old, bytes):
+                    value_old = value_old.decode("utf-8")
+                if isinstance(value, bytes):
+                    value = value.decode("utf-8")
+                if value != value_old:
+                    task_dict["new"][h5key] = value
+                    task_dict["old"][h5key] = value_old
+                    if isinstance(value, str):  # (after task_dict)
+                        value = numpy.string_(value.encode("utf-8"))
+                    h5.attrs[h5key] = value
+    if task_dict["new"]:
+        return task_dict
+    else:
+        return None
 
 
 # Make Ctr+C close the app
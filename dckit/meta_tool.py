@@ -232,3 +232,68 @@ def get_sample_name(fname):
     if isinstance(sample, bytes):
         sample = sample.decode("utf-8")
     return sample
+
+
+def get_summary(fname):
+    """Get the metadata shown in the DCKit table with a single file open
+
+    Parameters
+    ----------
+    fname: str
+        Path to an experimental data file. The file format is
+        determined from the file extension (tdms or rtdc).
+
+    Returns
+    -------
+    summary: dict
+        Dictionary with the keys "sample", "run index", "event count",
+        "flow rate", and "chip region"
+
+    Notes
+    -----
+    The results are cached. The modification time of the file is
+    part of the cache key, so the cache is invalidated whenever
+    the file is modified.
+    """
+    fname = pathlib.Path(fname).resolve()
+    return get_summary_cached(fname, fname.stat().st_mtime_ns).copy()
+
+
+@functools.lru_cache(maxsize=4096)
+def get_summary_cached(fname, mtime_ns):
+    """Caching function for `get_summary` (use that function instead)"""
+    ext = fname.suffix
+    if ext == ".rtdc":
+        with h5py.File(fname, mode="r") as h5:
+            attrs = h5.attrs
+            summary = {"sample": attrs["experiment:sample"],
+                       "run index": attrs["experiment:run index"],
+                       "event count": attrs.get("experiment:event count"),
+                       "flow rate": attrs["setup:flow rate"],
+                       "chip region": attrs["setup:chip region"],
+                       }
+        if isinstance(summary["sample"], bytes):
+            summary["sample"] = summary["sample"].decode("utf-8")
+        if isinstance(summary["chip region"], bytes):
+            summary["chip region"] = summary["chip region"].decode("utf-8")
+        if summary["event count"] is None:
+            summary["event count"] = get_event_count(fname)
+    elif ext == ".tdms":
+        # parse the MX_para.ini file only once
+        para = fname.parent / (fname.name.split("_")[0] + "_para.ini")
+        if para.exists():
+            camcfg = rt_config.load_from_file(para)
+            flow_rate = camcfg["general"]["flow rate [ul/s]"]
+            chip_region = camcfg["general"]["region"].lower()
+        else:
+            flow_rate = get_flow_rate(fname)
+            chip_region = get_chip_region(fname)
+        summary = {"sample": get_sample_name(fname),
+                   "run index": get_run_index(fname),
+                   "event count": get_event_count(fname),
+                   "flow rate": flow_rate,
+                   "chip region": chip_region,
+                   }
+    else:
+        raise ValueError("`fname` must be an .rtdc or .tdms file!")
+    return summary
@@ -0,0 +1,194 @@
+"""Model/view classes for the table of imported measurements"""
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+#: text colors for the integrity check results
+INTEGRITY_COLORS = {"failed": "#A50000",
+                    "tolerable": "#7A6500",
+                    "passed": "#007A04"}
+
+
+class DCKitModel(QtCore.QAbstractTableModel):
+    """Table model holding all imported measurements
+
+    The row data are stored column-wise in parallel lists. Qt only
+    queries the visible cells via :func:`data`, so no per-cell
+    objects are created when many datasets are imported.
+    """
+    #: column headers
+    headers = ["ID", "Integrity", "Path", "Sample", "Run idx", "Events",
+               "Flow rate"]
+    #: column indices
+    COL_ID = 0
+    COL_INTEGRITY = 1
+    COL_PATH = 2
+    COL_SAMPLE = 3
+    COL_RUN_INDEX = 4
+    COL_EVENT_COUNT = 5
+    COL_FLOW_RATE = 6
+
+    def __init__(self, *args, **kwargs):
+        super(DCKitModel, self).__init__(*args, **kwargs)
+        #: DCKit-ids (index in `DCKit.pathlist`)
+        self._ids = []
+        #: integrity check states
+        self._integrity = []
+        #: dataset paths (`pathlib.Path`)
+        self._paths = []
+        #: sample names (editable)
+        self._samples = []
+        #: run indices
+        self._run_indices = []
+        #: event counts
+        self._event_counts = []
+        #: flow rates (already formatted)
+        self._flow_rates = []
+
+    def _columns(self):
+        return [self._ids,
+                self._integrity,
+                self._paths,
+                self._samples,
+                self._run_indices,
+                self._event_counts,
+                self._flow_rates,
+                ]
+
+    def append_rows(self, rows):
+        """Append multiple rows to the table
+
+        Parameters
+        ----------
+        rows: list of tuples
+            Each tuple contains the DCKit-id, path, sample name,
+            run index, event count, and formatted flow rate
+        """
+        if not rows:
+            return
+        first = len(self._ids)
+        self.beginInsertRows(QtCore.QModelIndex(),
+                             first, first + len(rows) - 1)
+        for did, path, sample, run_index, event_count, flow_rate in rows:
+            self._ids.append(did)
+            self._integrity.append("run check")
+            self._paths.append(path)
+            self._samples.append(sample)
+            self._run_indices.append(run_index)
+            self._event_counts.append(event_count)
+            self._flow_rates.append(flow_rate)
+        self.endInsertRows()
+
+    def clear(self):
+        """Remove all rows"""
+        self.beginResetModel()
+        for col in self._columns():
+            col.clear()
+        self.endResetModel()
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        col = index.column()
+        if role in [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole]:
+            if col == self.COL_PATH:
+                return self._paths[row].name
+            else:
+                return str(self._columns()[col][row])
+        elif role == QtCore.Qt.ToolTipRole and col == self.COL_PATH:
+            return str(self._paths[row])
+        return None
+
+    def flags(self, index):
+        if index.column() == self.COL_SAMPLE:
+            # allow editing sample name
+            return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable
+        else:
+            return QtCore.Qt.ItemIsEnabled
+
+    def get_path(self, row):
+        return self._paths[row]
+
+    def get_sample(self, row):
+        return self._samples[row]
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole:
+            if orientation == QtCore.Qt.Horizontal:
+                return self.headers[section]
+            else:
+                return str(section + 1)
+        return None
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._ids)
+
+    def set_integrity(self, row, state):
+        """Set the integrity check state of a row"""
+        self._integrity[row] = state
+        index = self.index(row, self.COL_INTEGRITY)
+        self.dataChanged.emit(index, index)
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if (not index.isValid()
+                or role != QtCore.Qt.EditRole
+                or index.column() != self.COL_SAMPLE):
+            return False
+        self._samples[index.row()] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        if not self._ids:
+            return
+        if column == self.COL_PATH:
+            values = [pp.name for pp in self._paths]
+        else:
+            values = self._columns()[column]
+        order_idx = sorted(range(len(values)),
+                           key=values.__getitem__,
+                           reverse=order == QtCore.Qt.DescendingOrder)
+        self.layoutAboutToBeChanged.emit()
+        for col in self._columns():
+            col[:] = [col[ii] for ii in order_idx]
+        self.layoutChanged.emit()
+
+
+class IntegrityButtonDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints the integrity check state as a clickable button
+
+    The `clicked` signal is emitted with the row of the button.
+    """
+    clicked = QtCore.pyqtSignal(int)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QtCore.QEvent.MouseButtonRelease
+                and event.button() == QtCore.Qt.LeftButton
+                and option.rect.contains(event.pos())):
+            self.clicked.emit(index.row())
+            return True
+        return False
+
+    def paint(self, painter, option, index):
+        opt = QtWidgets.QStyleOptionButton()
+        opt.rect = option.rect
+        opt.palette = option.palette
+        opt.state = QtWidgets.QStyle.State_Enabled \
+            | QtWidgets.QStyle.State_Raised
+        opt.text = index.data()
+        if opt.text in INTEGRITY_COLORS:
+            opt.palette.setColor(QtGui.QPalette.ButtonText,
+                                 QtGui.QColor(INTEGRITY_COLORS[opt.text]))
+        if option.widget is not None:
+            style = option.widget.style()
+        else:
+            style = QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_PushButton, opt, painter,
+                          option.widget)
@@ -3,6 +3,7 @@ import dclab
 import h5py
 import numpy as np
 from PyQt5.QtWidgets import QFileDialog, QDialog, QMessageBox, QInputDialog
+import pytest
 
 from dckit.main import DCKit
 
@@ -25,6 +26,38 @@ def test_list_entries(qtbot):
     assert meta["experiment"]["sample"] == "calibration_beads"
 
 
+def test_list_entries_invalid(qtbot, tmp_path):
+    mw = DCKit()
+    qtbot.addWidget(mw)
+    path = retrieve_data("rtdc_data_hdf5_rtfdc.zip")
+    path_bad = tmp_path / "bad.rtdc"
+    path_bad.write_text("no hdf5 data")
+    with pytest.warns(UserWarning, match="Could not append dataset"):
+        mw.append_paths([path_bad, path])
+    assert mw.model.rowCount() == 1
+    assert mw.get_path(0) == path
+
+
+def test_list_entries_reset_empty_sample(qtbot):
+    mw = DCKit()
+    qtbot.addWidget(mw)
+    path = retrieve_data("rtdc_data_hdf5_rtfdc.zip")
+    mw.append_paths([path])
+    mw.model.setData(mw.model.index(0, 3), "")
+    assert mw.model.get_sample(0) == "calibration_beads"
+
+
+def test_task_integrity_all(qtbot):
+    mw = DCKit()
+    qtbot.addWidget(mw)
+    path = retrieve_data("rtdc_data_hdf5_rtfdc.zip")
+    mw.append_paths([path, path])
+    assert mw.model.index(1, 1).data() == "run check"
+    mw.on_task_integrity_all()
+    for row in range(2):
+        assert mw.model.index(row, 1).data() in ["passed", "tolerable"]
+
+
 def test_task_compress(qtbot, monkeypatch):
     path = retrieve_data("rtdc_data_hdf5_rtfdc.zip")
     path_out = path.with_name("compressed")
@@ -103,7 +136,7 @@ def test_task_metadata_sample(qtbot, monkeypatch):
     qtbot.addWidget(mw)
     path = retrieve_data("rtdc_data_hdf5_rtfdc.zip")
     mw.append_paths([path])
-    mw.tableWidget.item(0, 3).setText("Peter Pan")
+    mw.model.setData(mw.model.index(0, 3), "Peter Pan")
     mw.on_task_metadata()
     with dclab.new_dataset(path) as ds:
         assert ds.config["experiment"]["sample"] == "Peter Pan"
@@ -147,7 +180,7 @@ def test_task_tdms2rtdc(qtbot, monkeypatch):
     mw = DCKit()
     qtbot.addWidget(mw)
     mw.append_paths([path])
-    assert mw.tableWidget.rowCount() == 1
+    assert mw.model.rowCount() == 1
     paths_converted, invalid, errors = mw.on_task_tdms2rtdc()
     assert len(errors) == 0
     assert len(invalid) == 0
@@ -184,7 +217,7 @@ def test_task_tdms2rtdc_bad_online_contour_no_absdiff(qtbot, monkeypatch):
     mw = DCKit()
     qtbot.addWidget(mw)
     mw.append_paths([path])
-    assert mw.tableWidget.rowCount() == 1
+    assert mw.model.rowCount() == 1
     paths_converted, invalid, errors = mw.on_task_tdms2rtdc()
     assert len(errors) == 0
     assert len(invalid) == 0
@@ -38,7 +38,7 @@ def test_integrity_shapein_issue3(qtbot, monkeypatch):
     mw = DCKit()
     qtbot.addWidget(mw)
     mw.append_paths([h5path_m])
-    assert mw.tableWidget.rowCount() == 1, "sanity check"
+    assert mw.model.rowCount() == 1, "sanity check"
     # Now edit the medium (create dialog manually)
     with pytest.warns(MetadataEditedWarning):
         dlg = IntegrityCheckDialog(mw, h5path_m)
@@ -90,7 +90,7 @@ def test_integrity_shapein_issue3_control(qtbot, monkeypatch):
     mw = DCKit()
     qtbot.addWidget(mw)
     mw.append_paths([h5path_m])
-    assert mw.tableWidget.rowCount() == 1, "sanity check"
+    assert mw.model.rowCount() == 1, "sanity check"
     # Now edit the medium (create dialog manually)
     dlg = IntegrityCheckDialog(mw, h5path_m)
     assert dlg.get_metadata_value("setup", "medium") == "CellCarrierB"
@@ -132,7 +132,7 @@ def test_integrity_shapein_issue3_control_2(qtbot, monkeypatch):
     mw = DCKit()
     qtbot.addWidget(mw)
     mw.append_paths([h5path_m])
-    assert mw.tableWidget.rowCount() == 1, "sanity check"
+    assert mw.model.rowCount() == 1, "sanity check"
     # Now edit the medium (create dialog manually)
     dlg = IntegrityCheckDialog(mw, h5path_m)
     assert dlg.get_metadata_value("setup", "medium") == "CellCarrierB"
@@ -167,7 +167,7 @@ def test_integrity_with_medium(qtbot, monkeypatch):
     mw = DCKit()
     qtbot.addWidget(mw)
     mw.append_paths([path])
-    assert mw.tableWidget.rowCount() == 1, "sanity check"
+    assert mw.model.rowCount() == 1, "sanity check"
     # Now edit the medium (create dialog manually)
     dlg = IntegrityCheckDialog(mw, path)
     assert dlg.get_metadata_value("setup", "medium") is None
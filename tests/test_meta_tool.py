@@ -0,0 +1,35 @@
+"""Test metadata retrieval"""
+import h5py
+
+from dckit import meta_tool
+
+from helper_methods import retrieve_data
+
+
+def test_get_summary_rtdc():
+    path = retrieve_data("rtdc_data_hdf5_rtfdc.zip")
+    summary = meta_tool.get_summary(path)
+    assert summary["sample"] == meta_tool.get_sample_name(path)
+    assert summary["run index"] == meta_tool.get_run_index(path)
+    assert summary["event count"] == meta_tool.get_event_count(path)
+    assert summary["flow rate"] == meta_tool.get_flow_rate(path)
+    assert summary["chip region"] == meta_tool.get_chip_region(path)
+
+
+def test_get_summary_rtdc_modified():
+    path = retrieve_data("rtdc_data_hdf5_rtfdc.zip")
+    assert meta_tool.get_summary(path)["sample"] == "calibration_beads"
+    with h5py.File(path, "a") as h5:
+        h5.attrs["experiment:sample"] = "Peter Pan"
+    # the cache must not be used for modified files
+    assert meta_tool.get_summary(path)["sample"] == "Peter Pan"
+
+
+def test_get_summary_tdms():
+    path = retrieve_data("rtdc_data_traces_video.zip")
+    summary = meta_tool.get_summary(path)
+    assert summary["sample"] == meta_tool.get_sample_name(path)
+    assert summary["run index"] == meta_tool.get_run_index(path)
+    assert summary["event count"] == meta_tool.get_event_count(path)
+    assert summary["flow rate"] == meta_tool.get_flow_rate(path)
+    assert summary["chip region"] == meta_tool.get_chip_region(path)
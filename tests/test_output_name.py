@@ -0,0 +1,26 @@
+"""Test output file names"""
+import hashlib
+
+from dckit.main import get_rtdc_output_name, sha256
+
+from helper_methods import retrieve_data
+
+
+def test_rtdc_output_name():
+    path = retrieve_data("rtdc_data_hdf5_rtfdc.zip")
+    name = get_rtdc_output_name(origin_path=path, sample_name="Peter Pan")
+    assert name.endswith("_Peter_Pan_{}.rtdc".format(sha256(path)[:8]))
+
+
+def test_sha256():
+    path = retrieve_data("rtdc_data_hdf5_rtfdc.zip")
+    assert sha256(path) == hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_sha256_modified(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"peter")
+    assert sha256(path) == hashlib.sha256(b"peter").hexdigest()
+    # the cache must not be used for modified files
+    path.write_bytes(b"pan")
+    assert sha256(path) == hashlib.sha256(b"pan").hexdigest()